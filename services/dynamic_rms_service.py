@@ -1,9 +1,20 @@
+import math
 import numpy as np
 import threading
 import time
 import pyaudio
 import webrtcvad
 
+
+def frame_rms(audio_chunk):
+    """Return the normalised RMS (0..1) of a chunk of 16-bit PCM bytes."""
+    samples = np.frombuffer(audio_chunk, dtype=np.int16).astype(np.int64)
+    if samples.size == 0:
+        return 0.0
+    # Sum of squares on the integer samples; scale to [0, 1] once at the end
+    return math.sqrt(int(np.dot(samples, samples)) / samples.size) / 32767.0
+
+
 class DynamicRMSService:
     def __init__(self, sample_rate=16000, frame_ms=30, window_seconds=3, multiplier=2.0):
         self.sample_rate = sample_rate
@@ -11,8 +22,13 @@ class DynamicRMSService:
         self.vad = webrtcvad.Vad(3)
         self.multiplier = multiplier
         self.locked = False
-        self.rms_values = []
         self.window_size = int(window_seconds * 1000 / frame_ms)
+        # Ring buffer of background RMS values plus a running sum, so each
+        # update is O(1) instead of shifting and re-averaging a list.
+        self._ring = np.zeros(self.window_size, dtype=np.float64)
+        self._idx = 0
+        self._count = 0
+        self._sum = 0.0
         self.threshold = 0.15  # fallback default
         self.running = False
         self._lock = threading.Lock()
@@ -34,7 +50,10 @@ class DynamicRMSService:
     def reset(self):
         with self._lock:
             self.locked = False
-            self.rms_values.clear()
+            self._ring.fill(0.0)
+            self._idx = 0
+            self._count = 0
+            self._sum = 0.0
 
     def get_threshold(self):
         with self._lock:
@@ -43,22 +62,37 @@ class DynamicRMSService:
     def update_threshold(self, audio_chunk):
         """Manually update threshold based on audio chunk from main application."""
         try:
-            audio_np = np.frombuffer(audio_chunk, dtype=np.int16).astype(np.float32) / 32767.0
-            rms = np.sqrt(np.mean(audio_np**2))
-            
-            try:
-                is_speech = self.vad.is_speech(audio_chunk, sample_rate=self.sample_rate)
-            except Exception as e:
-                print(f"[ERROR] VAD failure in RMS update: {e}")
-                is_speech = False  # fallback
+            if not audio_chunk:
+                return
+            rms = frame_rms(audio_chunk)
+
+            with self._lock:
+                locked = self.locked
+                threshold = self.threshold
+            if locked:
+                return  # window is frozen, the VAD verdict would be discarded anyway
+
+            if rms < threshold * 0.5:
+                # Clearly below the noise gate: treat as background without running VAD
+                is_speech = False
+            else:
+                try:
+                    is_speech = self.vad.is_speech(audio_chunk, sample_rate=self.sample_rate)
+                except Exception as e:
+                    print(f"[ERROR] VAD failure in RMS update: {e}")
+                    is_speech = False  # fallback
             
             with self._lock:
                 if not self.locked and not is_speech:
-                    self.rms_values.append(rms)
-                    if len(self.rms_values) > self.window_size:
-                        self.rms_values.pop(0)
-                    if self.rms_values:
-                        self.threshold = np.mean(self.rms_values) * self.multiplier
+                    self._sum += rms - float(self._ring[self._idx])
+                    self._ring[self._idx] = rms
+                    self._idx = (self._idx + 1) % self.window_size
+                    if self._count < self.window_size:
+                        self._count += 1
+                    if self._idx == 0:
+                        # Re-sync once per lap so float drift can't accumulate
+                        self._sum = float(self._ring.sum())
+                    self.threshold = self._sum / self._count * self.multiplier
         except Exception as e:
             print(f"[ERROR] Failed to update RMS threshold: {e}")
 
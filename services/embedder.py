@@ -0,0 +1,67 @@
+"""
+Shared text embedder for the RAG services.
+
+Loading bge-small costs seconds and ~130 MB of weights, so the indexing and
+search services share a single instance per process.
+"""
+
+import os
+import threading
+import torch
+from llama_index.core.settings import Settings
+from llama_index.embeddings.huggingface import HuggingFaceEmbedding
+
+MODEL_NAME = "BAAI/bge-small-en-v1.5"
+EMBED_BATCH_SIZE = 256
+# Explicit device override for every process. Without it, query-time users
+# stay on CPU (one short embedding does not justify a CUDA context next to
+# Ollama) and only the indexer asks for the GPU.
+DEVICE_OVERRIDE = os.getenv("EMBEDDER_DEVICE")
+# fp16 halves the weights and runs on tensor cores; only applied on CUDA.
+# Set EMBEDDER_FP16=0 to stay on fp32.
+USE_FP16 = os.getenv("EMBEDDER_FP16", "1") == "1"
+# Opt-in: torch.compile pays off for long indexing runs but adds tens of
+# seconds of compilation on first use.
+COMPILE_MODEL = os.getenv("EMBEDDER_COMPILE", "0") == "1"
+
+_embedder = None
+_lock = threading.Lock()
+
+
+def get_embedder(prefer_gpu=False):
+    """Return the process-wide embedder, loading it on first use.
+
+    ``prefer_gpu`` places a newly loaded model on CUDA when one is available;
+    it has no effect once the embedder exists. The instance is also installed
+    as ``Settings.embed_model`` so LlamaIndex components pick it up by default.
+    """
+    global _embedder
+    with _lock:
+        if _embedder is None:
+            device = DEVICE_OVERRIDE or ("cuda" if prefer_gpu and torch.cuda.is_available() else "cpu")
+            _embedder = HuggingFaceEmbedding(
+                model_name=MODEL_NAME, embed_batch_size=EMBED_BATCH_SIZE, normalize=True,
+                device=device,
+            )
+            half = USE_FP16 and device.startswith("cuda")
+            if half:
+                _embedder._model.half()
+            print(f"[INFO] Embedder loaded on {device} ({'fp16' if half else 'fp32'}).")
+            if COMPILE_MODEL:
+                _compile(_embedder)
+        Settings.embed_model = _embedder
+    return _embedder
+
+
+def _compile(embedder):
+    """Swap the encoder's transformer for a torch.compile'd one and warm it up."""
+    transformer = embedder._model[0]
+    eager_model = transformer.auto_model
+    try:
+        transformer.auto_model = torch.compile(eager_model, dynamic=True)
+        # Trigger compilation now rather than on the first real batch
+        embedder.get_text_embedding_batch(["warmup"] * EMBED_BATCH_SIZE)
+        print("[INFO] Embedder compiled with torch.compile.")
+    except Exception as e:
+        transformer.auto_model = eager_model
+        print(f"[WARN] torch.compile unavailable for the embedder, using eager mode: {e}")
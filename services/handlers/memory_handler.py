@@ -1,12 +1,42 @@
 import re
 import os
+import atexit
+import threading
+
+_COMMAND_RE = re.compile(r"(remember to|update memory|remove memory|list memories)", re.IGNORECASE)
+# All memory commands in priority order. Each branch is a lookahead over the
+# whole prompt, so one match() call replaces four separate searches and keeps
+# the remember > update > remove > list precedence.
+_HANDLE_RE = re.compile(
+    r"(?=(?s:.*?)remember to (?P<remember>.+))"
+    r"|(?=(?s:.*?)update memory (?P<update_idx>\d+) to (?P<update_text>.+))"
+    r"|(?=(?s:.*?)remove memory (?P<remove_idx>\d+))"
+    r"|(?=(?s:.*?)(?P<list>list memories))",
+    re.IGNORECASE,
+)
+# Cheap substring probes that every memory command contains
+_COMMAND_KEYWORDS = ("remember to", "memor")
 
 class MemoryHandler:
-    def __init__(self, memory_file_path, text):
+    # Update/remove rewrite the whole file; coalesce bursts into one write
+    FLUSH_DELAY = 0.5
+
+    def __init__(self, memory_file_path, text, on_change=None):
         self.memory_file_path = memory_file_path
         self.text = text
+        # Called with the memory list after every mutation so owners can refresh
+        # derived state (the system prompt) without re-reading the file. Adds
+        # also pass the new memory so that state can be extended in place.
+        self.on_change = on_change
         self._ensure_file()
+        self._mtime_ns = None
         self.memories = self._load()
+        self._rendered = None  # "list memories" body, rebuilt after a change
+        # Guards the memory list and the pending-rewrite timer; re-entrant so
+        # mutations can schedule a save while holding it
+        self._flush_lock = threading.RLock()
+        self._flush_timer = None
+        atexit.register(self.flush)
 
     def _ensure_file(self):
         os.makedirs(os.path.dirname(self.memory_file_path), exist_ok=True)
@@ -14,42 +44,120 @@ class MemoryHandler:
             with open(self.memory_file_path, 'w'): pass
 
     def _load(self):
-        with open(self.memory_file_path, 'r') as f:
-            return [line.strip() for line in f if line.strip()]
+        with open(self.memory_file_path, 'rb') as f:
+            data = f.read()
+        # One read and one C-level split instead of iterating the file by line
+        memories = [line.strip() for line in data.decode('utf-8', 'replace').splitlines() if line.strip()]
+        self._mtime_ns = os.stat(self.memory_file_path).st_mtime_ns
+        return memories
+
+    def _refresh(self):
+        # The in-memory list is authoritative; only re-read after an external edit
+        with self._flush_lock:
+            if self._flush_timer is not None:
+                return
+            try:
+                mtime_ns = os.stat(self.memory_file_path).st_mtime_ns
+            except FileNotFoundError:
+                self._ensure_file()
+                mtime_ns = None
+            if mtime_ns != self._mtime_ns:
+                self.memories = self._load()
+                self._changed()
 
     def _save(self):
-        with open(self.memory_file_path, 'w') as f:
-            f.write('\n'.join(self.memories) + '\n')
+        # Write a sibling temp file and rename it over the original, so a crash
+        # mid-write never leaves a truncated memory.log behind
+        tmp_path = self.memory_file_path + '.tmp'
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            f.writelines(memory + '\n' for memory in self.memories)
+        os.replace(tmp_path, self.memory_file_path)
+        self._mtime_ns = os.stat(self.memory_file_path).st_mtime_ns
+
+    def _schedule_save(self):
+        with self._flush_lock:
+            if self._flush_timer is not None:
+                self._flush_timer.cancel()
+            self._flush_timer = threading.Timer(self.FLUSH_DELAY, self.flush)
+            self._flush_timer.daemon = True
+            self._flush_timer.start()
+
+    def flush(self):
+        """Write out a pending rewrite now."""
+        with self._flush_lock:
+            if self._flush_timer is None:
+                return
+            self._flush_timer.cancel()
+            self._save()
+            # Cleared only once written, so a failed rewrite stays pending
+            self._flush_timer = None
+
+    def _append(self, memory):
+        with open(self.memory_file_path, 'ab+') as f:
+            # A hand-edited file may lack the final newline; don't glue onto its last line
+            f.seek(0, os.SEEK_END)
+            if f.tell():
+                f.seek(-1, os.SEEK_END)
+                if f.read(1) != b'\n':
+                    f.write(b'\n')
+            f.write(memory.encode('utf-8') + b'\n')
+        self._mtime_ns = os.stat(self.memory_file_path).st_mtime_ns
+
+    def _changed(self, added=None):
+        self._rendered = None
+        if self.on_change:
+            self.on_change(self.memories, added)
 
     def can_handle(self, prompt: str) -> bool:
-        return bool(re.search(r"(remember to|update memory|remove memory|list memories)", prompt, re.IGNORECASE))
+        lowered = prompt.lower()
+        if not any(keyword in lowered for keyword in _COMMAND_KEYWORDS):
+            return False
+        return bool(_COMMAND_RE.search(prompt))
 
     def handle(self, prompt: str) -> str:
-        if m := re.search(r"remember to (.+)", prompt, re.IGNORECASE):
-            self.memories.append(m.group(1).strip())
-            self._save()
+        self._refresh()
+
+        m = _HANDLE_RE.match(prompt)
+        if not m:
+            return ""
+
+        if m["remember"] is not None:
+            memory = m["remember"].strip()
+            with self._flush_lock:
+                self.memories.append(memory)
+                if self._flush_timer is not None:
+                    # A pending rewrite will include it
+                    self._schedule_save()
+                else:
+                    self._append(memory)
+                self._changed(added=memory)
             return self.text.get("memory.add")
 
-        if m := re.search(r"update memory (\d+) to (.+)", prompt, re.IGNORECASE):
-            idx = int(m.group(1)) - 1
-            if 0 <= idx < len(self.memories):
-                self.memories[idx] = m.group(2).strip()
-                self._save()
-                return self.text.format("memory.update", index=idx + 1)
+        if m["update_idx"] is not None:
+            idx = int(m["update_idx"]) - 1
+            with self._flush_lock:
+                if 0 <= idx < len(self.memories):
+                    self.memories[idx] = m["update_text"].strip()
+                    self._schedule_save()
+                    self._changed()
+                    return self.text.format("memory.update", index=idx + 1)
             return self.text.get("memory.missing")
 
-        if m := re.search(r"remove memory (\d+)", prompt, re.IGNORECASE):
-            idx = int(m.group(1)) - 1
-            if 0 <= idx < len(self.memories):
-                self.memories.pop(idx)
-                self._save()
-                return self.text.format("memory.remove", index=idx + 1)
+        if m["remove_idx"] is not None:
+            idx = int(m["remove_idx"]) - 1
+            with self._flush_lock:
+                if 0 <= idx < len(self.memories):
+                    self.memories.pop(idx)
+                    self._schedule_save()
+                    self._changed()
+                    return self.text.format("memory.remove", index=idx + 1)
             return self.text.get("memory.missing")
 
-        if re.search(r"list memories", prompt, re.IGNORECASE):
+        if m["list"] is not None:
             if not self.memories:
                 return self.text.get("memory.empty")
-            return self.text.get("memory.list_prefix") + "\n" + '\n'.join(
-                [f"{i+1}. {m}" for i, m in enumerate(self.memories)])
+            if self._rendered is None:
+                self._rendered = '\n'.join(f"{i+1}. {m}" for i, m in enumerate(self.memories))
+            return self.text.get("memory.list_prefix") + "\n" + self._rendered
 
         return ""
@@ -1,9 +1,33 @@
 import re
 import os
+import json
 from datetime import datetime
 
+try:
+    import orjson
+except ImportError:  # optional: stdlib json writes the same JSON Lines, just slower
+    orjson = None
+
+
+def _encode(note):
+    if orjson:
+        return orjson.dumps(note) + b"\n"
+    return (json.dumps(note) + "\n").encode("utf-8")
+
+
+def _decode(line):
+    return orjson.loads(line) if orjson else json.loads(line)
+
+
+_NOTE_RE = re.compile(r"\b(note|notes|take a note|delete note|show notes)\b", re.IGNORECASE)
+_TAKE_NOTE_RE = re.compile(r"take a note[:\-]?\s*(.+)", re.IGNORECASE)
+_SHOW_NOTES_RE = re.compile(r"(show|list) notes", re.IGNORECASE)
+_DELETE_NOTE_RE = re.compile(r"delete note (\d+)", re.IGNORECASE)
+
 class NoteHandler:
-    def __init__(self, note_path="config/notes.json"):
+    # Notes are stored as JSON Lines so adding one is a single append;
+    # only deletes rewrite the file.
+    def __init__(self, note_path="config/notes.jsonl"):
         self.path = note_path
         self._ensure_file()
         self.notes = self._load()
@@ -11,35 +35,48 @@ class NoteHandler:
     def _ensure_file(self):
         os.makedirs(os.path.dirname(self.path), exist_ok=True)
         if not os.path.exists(self.path):
-            with open(self.path, "w") as f:
-                f.write("[]")
+            legacy_path = os.path.splitext(self.path)[0] + ".json"
+            notes = []
+            if os.path.exists(legacy_path):
+                # One-time migration from the old pretty-printed JSON array. The
+                # legacy file is left in place; notes.jsonl wins once it exists.
+                with open(legacy_path, "r") as f:
+                    notes = json.load(f)
+            with open(self.path, "wb") as f:
+                f.write(b"".join(_encode(note) for note in notes))
 
     def _load(self):
-        import json
-        with open(self.path, "r") as f:
-            return json.load(f)
+        with open(self.path, "rb") as f:
+            return [_decode(line) for line in f if line.strip()]
+
+    def _append(self, note):
+        with open(self.path, "ab") as f:
+            f.write(_encode(note))
 
     def _save(self):
-        import json
-        with open(self.path, "w") as f:
-            json.dump(self.notes, f, indent=2)
+        with open(self.path, "wb") as f:
+            f.write(b"".join(_encode(note) for note in self.notes))
 
     def can_handle(self, prompt):
-        return bool(re.search(r"\b(note|notes|take a note|delete note|show notes)\b", prompt, re.IGNORECASE))
+        # Every note command contains "note"; skip the regex when it can't match
+        if "note" not in prompt.lower():
+            return False
+        return bool(_NOTE_RE.search(prompt))
 
     def handle(self, prompt):
-        if m := re.search(r"take a note[:\-]?\s*(.+)", prompt, re.IGNORECASE):
-            self.notes.append({"text": m.group(1).strip(), "timestamp": datetime.now().isoformat()})
-            self._save()
+        if m := _TAKE_NOTE_RE.search(prompt):
+            note = {"text": m.group(1).strip(), "timestamp": datetime.now().isoformat()}
+            self.notes.append(note)
+            self._append(note)
             return "Got it. Note saved."
 
-        if re.search(r"(show|list) notes", prompt, re.IGNORECASE):
+        if _SHOW_NOTES_RE.search(prompt):
             if not self.notes:
                 return "You have no notes yet."
             return "Here are your notes:\n" + "\n".join(
                 f"{i+1}. {n['text']}" for i, n in enumerate(self.notes))
 
-        if m := re.search(r"delete note (\d+)", prompt, re.IGNORECASE):
+        if m := _DELETE_NOTE_RE.search(prompt):
             idx = int(m.group(1)) - 1
             if 0 <= idx < len(self.notes):
                 removed = self.notes.pop(idx)
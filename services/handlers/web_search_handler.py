@@ -1,12 +1,63 @@
+import re
+import time
+from collections import OrderedDict
+import ollama
+
 class WebSearchHandler:
-    def __init__(self, web_search_service, model, system_prompt, text):
+    # Reply cache: the same question asked again within the TTL, at the same
+    # point in the conversation, reuses the summary and skips both the web
+    # request and the summarization call. Matching is exact on the normalized
+    # question so near-but-different questions never share an answer.
+    CACHE_TTL = 600
+    CACHE_SIZE = 128
+    # Trailing turns folded into the key so follow-ups ("and tomorrow?") stay
+    # tied to what they follow
+    CACHE_CONTEXT_TURNS = 2
+
+    _NORMALIZE_RE = re.compile(r"[^\w\s]+")
+
+    def __init__(self, web_search_service, model, system_prompt, text, client=None, keep_alive=None,
+                 context=None):
         self.web = web_search_service
         self.model = model
         self.system_prompt = system_prompt
+        # Optional callable returning the chat's current message prefix. Sending
+        # the same prefix as regular turns lets Ollama reuse its prompt cache.
+        self.context = context
         self.text = text
+        self.client = client or ollama.Client()
+        self.keep_alive = keep_alive
+        self._cache = OrderedDict()  # key -> (timestamp, reply), oldest first
+
+    def _cache_key(self, prompt, prefix):
+        question = " ".join(self._NORMALIZE_RE.sub(" ", prompt.lower()).split())
+        recent = tuple(
+            (message['role'], message['content']) for message in prefix[-self.CACHE_CONTEXT_TURNS:]
+            if message['role'] != 'system'
+        )
+        return question, recent
+
+    def _cache_lookup(self, key):
+        entry = self._cache.get(key)
+        if entry is None:
+            return None
+        if time.monotonic() - entry[0] >= self.CACHE_TTL:
+            del self._cache[key]
+            return None
+        return entry[1]
+
+    def _cache_store(self, key, reply):
+        self._cache[key] = (time.monotonic(), reply)
+        self._cache.move_to_end(key)
+        if len(self._cache) > self.CACHE_SIZE:
+            self._cache.popitem(last=False)
 
     def handle(self, prompt: str) -> str:
-        import ollama
+        prefix = self.context() if self.context else [self.system_prompt]
+        key = self._cache_key(prompt, prefix)
+        cached = self._cache_lookup(key)
+        if cached is not None:
+            return cached
 
         results = self.web.search(prompt)
         if not results:
@@ -26,7 +77,9 @@ class WebSearchHandler:
             )
         }
 
-        response = ollama.chat(model=self.model, messages=[
-            self.system_prompt, summarization_prompt
-        ])
-        return response['message']['content']
+        response = self.client.chat(
+            model=self.model, keep_alive=self.keep_alive, messages=[*prefix, summarization_prompt]
+        )
+        reply = response['message']['content']
+        self._cache_store(key, reply)
+        return reply
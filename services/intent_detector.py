@@ -1,12 +1,23 @@
 import re
 
+# Intents in priority order. Each branch is a lookahead over the whole prompt,
+# so one match() call tries them in order and lastgroup names the winner.
+_INTENT_RE = re.compile(
+    r"(?=.*?\b(?P<memory>remember to|update memory|remove memory|list memories)\b)"
+    r"|(?=.*?\b(?P<file_search>find|search|locate|where is)\b)"
+    r"|(?=.*?\b(?P<web_search>search|look up|what is|who is|tell me about)\b)",
+    re.IGNORECASE | re.DOTALL,
+)
+# Every intent keyword contains one of these, so a prompt without any of them
+# is "default" without entering the regex engine.
+_INTENT_KEYWORDS = ("remember to", "memor", "find", "search", "locate", "where is",
+                    "look up", "what is", "who is", "tell me about")
+
 class IntentDetector:
     def detect(self, prompt: str) -> str:
-        if re.search(r"\b(remember to|update memory|remove memory|list memories)\b", prompt, re.IGNORECASE):
-            return "memory"
-        if re.search(r"\b(find|search|locate|where is)\b", prompt, re.IGNORECASE):
-            return "file_search"
-        if re.search(r"\b(search|look up|what is|who is|tell me about)\b", prompt.lower()):
-            return "web_search"
-        return "default"
+        lowered = prompt.lower()
+        if not any(keyword in lowered for keyword in _INTENT_KEYWORDS):
+            return "default"
+        m = _INTENT_RE.match(prompt)
+        return m.lastgroup if m else "default"
 
@@ -2,11 +2,11 @@ import numpy as np
 import logging
 from collections import deque
 import time
+from .dynamic_rms_service import frame_rms
 
 class KWDService:
     # --- Configuration ---
     RATE = 16000
-    MAX_INT16 = 32767.0
     OWW_EXPECTED_SAMPLES = 16000  # openwakeword expects 1 second of audio
     COOLDOWN_SECONDS = 2.0  # Cooldown period after detection
 
@@ -66,8 +66,7 @@ class KWDService:
         
         # 1. Check RMS threshold - skip if audio is too quiet (background noise)
         dynamic_threshold = self.dynamic_rms.get_threshold()
-        audio_np = chunk_np.astype(np.float32) / self.MAX_INT16
-        current_rms = np.sqrt(np.mean(audio_np**2))
+        current_rms = frame_rms(audio_chunk_bytes)
         
         if current_rms <= dynamic_threshold:
             # Audio is below dynamic threshold, likely background noise
@@ -1,74 +1,143 @@
 import os
+import json
+import functools
+import numpy as np
+import faiss
 from llama_index.core import StorageContext, load_index_from_storage
-from llama_index.core.settings import Settings
-from llama_index.embeddings.huggingface import HuggingFaceEmbedding
 from llama_index.vector_stores.faiss import FaissVectorStore
+from .embedder import get_embedder
+from .llama_indexing_service import FILE_PATHS_FNAME
 from pathlib import Path
 
+# Where FaissVectorStore.persist() writes the raw FAISS index
+VECTOR_STORE_FNAME = "default__vector_store.json"
+
 class LlamaFileSearchService:
     def __init__(self, index_path="config/faiss_index"):
         self.index_path = index_path
         self.index = None
+        self._faiss = None
+        self._file_paths = []
         self._initialize_embedder()
+        # Repeated queries skip the transformer forward pass entirely
+        self._embed_query = functools.lru_cache(maxsize=1024)(self._compute_query_embedding)
         self._load_index()
 
     def _initialize_embedder(self):
-        Settings.embed_model = HuggingFaceEmbedding(model_name="BAAI/bge-small-en-v1.5")
+        self.embed_model = get_embedder()
+
+    def _compute_query_embedding(self, normalized_query):
+        # Tuples keep cached vectors immutable
+        return tuple(self.embed_model.get_query_embedding(normalized_query))
 
     def _load_index(self):
         if not os.path.exists(self.index_path):
             print(f"[INFO] Index path {self.index_path} does not exist. Run indexing first.")
             return
 
+        if self._load_mmap_index():
+            return
+
         try:
-            storage_context = StorageContext.from_defaults(persist_dir=self.index_path)
+            vector_store = FaissVectorStore.from_persist_dir(self.index_path)
+            storage_context = StorageContext.from_defaults(
+                vector_store=vector_store, persist_dir=self.index_path
+            )
             self.index = load_index_from_storage(storage_context)
+            self._faiss = vector_store._faiss_index
+            self._file_paths = self._build_file_path_table()
             print("[INFO] FAISS index loaded successfully.")
         except Exception as e:
             print(f"[ERROR] Failed to load index: {e}")
             self.index = None
+            self._faiss = None
+            self._file_paths = []
+
+    def _load_mmap_index(self):
+        """Map the FAISS file read-only and load only the id -> file path sidecar.
+
+        The OS pages in just the parts of the index a query touches, and the
+        docstore is never deserialized. Returns False to fall back to a full load.
+        """
+        faiss_file = os.path.join(self.index_path, VECTOR_STORE_FNAME)
+        sidecar = os.path.join(self.index_path, FILE_PATHS_FNAME)
+        if not (os.path.exists(faiss_file) and os.path.exists(sidecar)):
+            return False
+
+        try:
+            faiss_index = faiss.read_index(faiss_file, faiss.IO_FLAG_MMAP | faiss.IO_FLAG_READ_ONLY)
+            with open(sidecar, "r") as f:
+                file_paths = json.load(f)
+            if len(file_paths) != faiss_index.ntotal:
+                print("[WARN] File path sidecar does not match the FAISS index. Loading the full index.")
+                return False
+        except Exception as e:
+            print(f"[WARN] Failed to mmap FAISS index, loading the full index: {e}")
+            return False
+
+        self._faiss = faiss_index
+        self._file_paths = file_paths
+        print("[INFO] FAISS index mapped successfully.")
+        return True
+
+    def _build_file_path_table(self):
+        # FAISS row id -> source file path, resolved once at load instead of
+        # going through the docstore for every hit.
+        table = [''] * self._faiss.ntotal
+        docstore = self.index.docstore
+        for vector_id, node_id in self.index.index_struct.nodes_dict.items():
+            node = docstore.get_node(node_id, raise_error=False)
+            if node is not None:
+                table[int(vector_id)] = node.metadata.get('file_path', '')
+        return table
+
+    @staticmethod
+    def _empty_results():
+        return {
+            "exact_matches": [],
+            "fuzzy_matches": [],
+            "content_matches": [],
+            "all_results": []
+        }
+
+    def _query_vectors(self, queries):
+        vectors = np.asarray(
+            [self._embed_query(query.strip().lower()) for query in queries], dtype=np.float32
+        )
+        # The index stores unit vectors and ranks by inner product
+        faiss.normalize_L2(vectors)
+        return vectors
+
+    def _results_for_row(self, ids):
+        # Extract file paths from the hit ids, de-duplicating in rank order
+        file_paths = list(dict.fromkeys(
+            self._file_paths[i] for i in ids if 0 <= i < len(self._file_paths) and self._file_paths[i]
+        ))
+
+        # For compatibility with the existing handler, classify results
+        # In this vector-based approach, all results are essentially "content matches"
+        return {
+            "exact_matches": [],  # Vector search doesn't do exact filename matching
+            "fuzzy_matches": [],  # Vector search doesn't do fuzzy filename matching
+            "content_matches": file_paths,
+            "all_results": file_paths
+        }
 
     def search(self, query: str, top_k: int = 10):
-        if self.index is None:
-            return {
-                "exact_matches": [],
-                "fuzzy_matches": [],
-                "content_matches": [],
-                "all_results": []
-            }
+        return self.search_batch([query], top_k)[0]
+
+    def search_batch(self, queries, top_k: int = 10):
+        """Search several queries with a single FAISS call."""
+        if self._faiss is None or not queries:
+            return [self._empty_results() for _ in queries]
 
         try:
-            # Query the index
-            query_engine = self.index.as_query_engine(similarity_top_k=top_k)
-            response = query_engine.query(query)
-            
-            # Extract file paths from source nodes
-            file_paths = []
-            if hasattr(response, 'source_nodes') and response.source_nodes:
-                for node in response.source_nodes:
-                    if hasattr(node, 'node') and hasattr(node.node, 'metadata'):
-                        file_path = node.node.metadata.get('file_path', '')
-                        if file_path and file_path not in file_paths:
-                            file_paths.append(file_path)
-            
-            # For compatibility with the existing handler, classify results
-            # In this vector-based approach, all results are essentially "content matches"
-            return {
-                "exact_matches": [],  # Vector search doesn't do exact filename matching
-                "fuzzy_matches": [],  # Vector search doesn't do fuzzy filename matching  
-                "content_matches": file_paths,
-                "all_results": file_paths
-            }
-            
+            _, ids = self._faiss.search(self._query_vectors(queries), top_k)
+            return [self._results_for_row(row) for row in ids]
+
         except Exception as e:
             print(f"[ERROR] Search failed: {e}")
-            return {
-                "exact_matches": [],
-                "fuzzy_matches": [],
-                "content_matches": [],
-                "all_results": []
-            }
+            return [self._empty_results() for _ in queries]
 
     def is_index_available(self):
-        return self.index is not None
-
+        return self._faiss is not None
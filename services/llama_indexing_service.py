@@ -1,67 +1,223 @@
 
 import os
 import json
+import math
+import numpy as np
 from llama_index.core import SimpleDirectoryReader, VectorStoreIndex, StorageContext
+from llama_index.core.schema import MetadataMode
 from llama_index.core.settings import Settings
-from llama_index.embeddings.huggingface import HuggingFaceEmbedding
 from llama_index.vector_stores.faiss import FaissVectorStore
+from .embedder import get_embedder
 import faiss
 
+# Sidecar mapping FAISS row id -> source file path, so search can skip the docstore
+FILE_PATHS_FNAME = "file_paths.json"
+
 class LlamaIndexingService:
-    def __init__(self, config_path="config/search_config.json", index_path="config/faiss_index"):
+    # Vectors sampled to train the IVF/PQ quantizers (more if nlist needs them)
+    MAX_TRAINING_SAMPLES = 50000
+    # Document types worth parsing; everything else (media, archives, binaries)
+    # is skipped before any reader touches it. Overridable via "extensions".
+    DEFAULT_EXTENSIONS = [".txt", ".md", ".rst", ".pdf", ".docx", ".pptx", ".csv", ".epub", ".ipynb"]
+    # Default cap on parser processes. Spawned workers re-import the caller's
+    # main module (torch, wake word models), so each one is expensive to start.
+    MAX_DEFAULT_WORKERS = 4
+
+    def __init__(self, config_path="config/search_config.json", index_path="config/faiss_index", num_workers=None,
+                 nlist=None, pq_m=32, nprobe=None):
         self.config_path = config_path
         self.index_path = index_path
+        # IVFPQ tuning: nlist defaults to ~sqrt(N) and nprobe to max(16, nlist // 8)
+        self.nlist = nlist
+        self.pq_m = pq_m
+        self.nprobe = nprobe
+        # PDF/DOCX parsing is CPU-bound; spread it across processes
+        self.num_workers = num_workers or max(1, min(self.MAX_DEFAULT_WORKERS, (os.cpu_count() or 1) - 1))
         self._initialize_embedder()
 
     def _initialize_embedder(self):
-        Settings.embed_model = HuggingFaceEmbedding(model_name="BAAI/bge-small-en-v1.5")
+        # Bulk embedding is where the GPU pays off
+        get_embedder(prefer_gpu=True)
 
-    def _load_search_paths(self):
+    def _load_search_config(self):
         try:
             with open(self.config_path, "r") as f:
-                data = json.load(f)
-                return [path for path in data.get("search_paths", []) if os.path.exists(path)]
+                return json.load(f)
         except Exception as e:
             print(f"[ERROR] Failed to load search paths: {e}")
-            return []
+            return {}
+
+    def _load_search_paths(self, config=None):
+        config = self._load_search_config() if config is None else config
+        return [path for path in config.get("search_paths", []) if os.path.exists(path)]
+
+    def _manifest_path(self):
+        return os.path.join(self.index_path, "file_manifest.json")
+
+    def _load_manifest(self):
+        try:
+            with open(self._manifest_path(), "r") as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return None
+
+    def _save_manifest(self, file_mtimes):
+        try:
+            with open(self._manifest_path(), "w") as f:
+                json.dump(file_mtimes, f)
+        except OSError as e:
+            print(f"[WARN] Failed to write index manifest: {e}")
+
+    def _remove_file_paths(self):
+        # A sidecar left from the previous build would map ids to the wrong files
+        try:
+            os.remove(os.path.join(self.index_path, FILE_PATHS_FNAME))
+        except FileNotFoundError:
+            pass
+
+    def _save_file_paths(self, index, nodes):
+        """Write the id -> file path sidecar atomically. Returns False on failure."""
+        node_paths = {node.node_id: node.metadata.get("file_path", "") for node in nodes}
+        file_paths = [""] * index.vector_store._faiss_index.ntotal
+        for vector_id, node_id in index.index_struct.nodes_dict.items():
+            file_paths[int(vector_id)] = node_paths.get(node_id, "")
+        sidecar = os.path.join(self.index_path, FILE_PATHS_FNAME)
+        try:
+            with open(sidecar + ".tmp", "w") as f:
+                json.dump(file_paths, f)
+            os.replace(sidecar + ".tmp", sidecar)
+        except OSError as e:
+            print(f"[WARN] Failed to write file path sidecar: {e}")
+            return False
+        return True
+
+    def _nlist_for(self, n_vectors):
+        # ~sqrt(N) over the whole corpus, not the training sample
+        return self.nlist or max(1, int(math.sqrt(n_vectors)))
+
+    def _create_faiss_index(self, training_vectors, nlist):
+        """Create an inner-product IVFPQ index trained on the given unit vectors.
+
+        Falls back to an int8 scalar-quantized flat index when there are too
+        few vectors to train the coarse and product quantizers.
+        """
+        n, d = training_vectors.shape
+        # k-means wants ~39 points per centroid: per IVF list, and per each of
+        # the 256 centroids of every 8-bit PQ codebook
+        min_training = max(39 * 256, 39 * nlist)
+        fallback_reason = None
+        if d % self.pq_m:
+            fallback_reason = f"Dimension {d} is not divisible by pq_m={self.pq_m}."
+        elif n < min_training:
+            fallback_reason = f"{n} vectors is too few to train IVFPQ (need {min_training})."
+        if fallback_reason:
+            print(f"[INFO] {fallback_reason} Using an SQ8 flat index.")
+            # 1 byte per dimension; training only learns per-dimension ranges
+            faiss_index = faiss.IndexScalarQuantizer(d, faiss.ScalarQuantizer.QT_8bit, faiss.METRIC_INNER_PRODUCT)
+            faiss_index.train(training_vectors)
+            return faiss_index
+
+        print(f"[INFO] Training IVFPQ index (nlist={nlist}, m={self.pq_m}) on {n} vectors...")
+        quantizer = faiss.IndexFlatIP(d)
+        faiss_index = faiss.IndexIVFPQ(quantizer, d, nlist, self.pq_m, 8, faiss.METRIC_INNER_PRODUCT)
+        faiss_index.train(training_vectors)
+        # Probe enough lists to keep recall close to the exact index
+        faiss_index.nprobe = self.nprobe or min(nlist, max(16, nlist // 8))
+        return faiss_index
 
     def build_and_save_index(self):
-        search_paths = self._load_search_paths()
+        config = self._load_search_config()
+        search_paths = self._load_search_paths(config)
         if not search_paths:
             print("[INFO] No valid search paths found. Aborting indexing.")
             return
+        extensions = config.get("extensions", self.DEFAULT_EXTENSIONS)
+        # Only the top level of each folder unless the config opts in
+        recursive = config.get("recursive", False)
 
-        print("[INFO] Loading documents from specified paths...")
-        all_documents = []
+        input_files = []
         for path in search_paths:
             try:
-                documents = SimpleDirectoryReader(input_dir=path).load_data()
-                all_documents.extend(documents)
-                print(f"[INFO] Loaded {len(documents)} documents from {path}")
+                reader = SimpleDirectoryReader(
+                    input_dir=path, required_exts=extensions, recursive=recursive, exclude_hidden=True
+                )
+                input_files.extend(reader.input_files)
             except Exception as e:
-                print(f"[WARN] Failed to load documents from {path}: {e}")
-        
-        documents = all_documents
-        
+                print(f"[WARN] Failed to scan {path}: {e}")
+
+        if not input_files:
+            print("[INFO] No documents found to index.")
+            return
+
+        # Skip the expensive parse + embed pass when no file was added, removed
+        # or modified since the last build.
+        file_mtimes = {}
+        for file_path in input_files:
+            try:
+                file_mtimes[str(file_path)] = os.path.getmtime(file_path)
+            except OSError:
+                continue
+        if os.path.exists(self.index_path) and self._load_manifest() == file_mtimes:
+            print("[INFO] Index is up to date. No files changed since the last build.")
+            return
+
+        # One reader over every tree keeps all workers busy until the end,
+        # instead of draining the pool at each directory boundary.
+        print(f"[INFO] Loading {len(input_files)} files from specified paths...")
+        try:
+            documents = SimpleDirectoryReader(input_files=input_files).load_data(
+                num_workers=self.num_workers if self.num_workers > 1 else None
+            )
+        except Exception as e:
+            print(f"[WARN] Failed to load documents: {e}")
+            documents = []
+
         if not documents:
             print("[INFO] No documents found to index.")
             return
 
         print(f"[INFO] Loaded {len(documents)} documents. Now creating FAISS index...")
-        # Get embedding dimension by creating a dummy embedding
-        dummy_embedding = Settings.embed_model.get_text_embedding("dummy query")
-        d = len(dummy_embedding)
+        # Chunk and embed everything up front in large batches. The same vectors
+        # train the quantizers and are stored on the nodes, so the index build
+        # below does not embed anything a second time.
+        nodes = Settings.node_parser.get_nodes_from_documents(documents)
+        print(f"[INFO] Embedding {len(nodes)} chunks...")
+        embeddings = Settings.embed_model.get_text_embedding_batch(
+            [node.get_content(metadata_mode=MetadataMode.EMBED) for node in nodes],
+            show_progress=True,
+        )
+        vectors = np.asarray(embeddings, dtype=np.float32)
+        # The float32 array replaces the list of Python floats; drop it early
+        # so both copies are not alive at peak
+        del embeddings
+        # Unit vectors make inner product equal cosine similarity, so the index
+        # can use plain dot products instead of L2 distances.
+        faiss.normalize_L2(vectors)
+        for node, vector in zip(nodes, vectors):
+            node.embedding = vector.tolist()
 
-        faiss_index = faiss.IndexFlatL2(d)
+        nlist = self._nlist_for(len(vectors))
+        # Keep enough samples for ~39 points per IVF list on very large corpora
+        max_samples = max(self.MAX_TRAINING_SAMPLES, 39 * nlist)
+        training_vectors = vectors
+        if len(vectors) > max_samples:
+            rows = np.random.choice(len(vectors), max_samples, replace=False)
+            training_vectors = vectors[rows]
+
+        faiss_index = self._create_faiss_index(training_vectors, nlist)
         vector_store = FaissVectorStore(faiss_index=faiss_index)
         storage_context = StorageContext.from_defaults(vector_store=vector_store)
 
-        index = VectorStoreIndex.from_documents(
-            documents, storage_context=storage_context
-        )
+        index = VectorStoreIndex(nodes=nodes, storage_context=storage_context)
 
         print(f"[INFO] Index created successfully. Saving to {self.index_path}...")
+        self._remove_file_paths()
         index.storage_context.persist(persist_dir=self.index_path)
+        if not self._save_file_paths(index, nodes):
+            # Leave the manifest stale so the next run rebuilds the sidecar
+            print("[WARN] Index saved without a file path sidecar; it will be rebuilt next run.")
+            return
+        self._save_manifest(file_mtimes)
         print("[INFO] Indexing complete.")
 
 
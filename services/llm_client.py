@@ -5,18 +5,31 @@ Provides the same interface as the original LLM service but communicates via HTT
 """
 
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 import time
+from typing import Iterator
 from .logger import app_logger
 from .exceptions import LLMException
 from .intent_detector import IntentDetector
+from .llm_streaming_client import StreamingLLMClient
 
 class LLMClient:
     """HTTP client for LLM microservice that mimics the original LLM service interface."""
     
     def __init__(self, host="127.0.0.1", port=8003, timeout=120):
         self.log = app_logger.get_logger("llm_client")
+        self.host = host
+        self.port = port
         self.base_url = f"http://{host}:{port}"
         self.timeout = timeout
+        self._streaming_client = None
+        # One pooled keep-alive session instead of a fresh connection per request
+        self.session = requests.Session()
+        self.session.mount("http://", HTTPAdapter(
+            pool_connections=1, pool_maxsize=4,
+            max_retries=Retry(total=2, backoff_factor=0.2)
+        ))
         self.intent_detector = IntentDetector()  # Add intent detector
         self.log.info(f"LLM client initialized for {self.base_url}")
     
@@ -24,7 +37,7 @@ class LLMClient:
         """Send prompt to LLM microservice for a response."""
         try:
             start_time = time.time()
-            response = requests.post(
+            response = self.session.post(
                 f"{self.base_url}/chat",
                 json={"prompt": prompt},
                 timeout=self.timeout
@@ -53,10 +66,22 @@ class LLMClient:
             self.log.error(error_msg)
             raise LLMException(error_msg) from e
     
+    def get_response_stream(self, prompt) -> Iterator[str]:
+        """
+        Stream the reply from the /chat/stream SSE endpoint, yielding text chunks
+        as they arrive so TTS can start on the first one.
+        """
+        if self._streaming_client is None:
+            # Reuses StreamingLLMClient's SSE handling over this client's session
+            self._streaming_client = StreamingLLMClient(
+                host=self.host, port=self.port, timeout=self.timeout, session=self.session
+            )
+        return self._streaming_client.get_response_stream(prompt)
+    
     def warmup_llm(self):
         """Send warmup request to LLM microservice."""
         try:
-            response = requests.post(
+            response = self.session.post(
                 f"{self.base_url}/warmup",
                 timeout=self.timeout
             )
@@ -77,7 +102,11 @@ class LLMClient:
     def health_check(self):
         """Check if the LLM microservice is responsive."""
         try:
-            response = requests.get(f"{self.base_url}/docs", timeout=5)
+            response = self.session.get(f"{self.base_url}/docs", timeout=5)
             return response.status_code == 200
         except:
             return False
+
+    def close(self):
+        """Release pooled connections."""
+        self.session.close()
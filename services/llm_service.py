@@ -1,12 +1,13 @@
 import ollama
 import os
 import time
+import atexit
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from collections import deque
 from datetime import datetime
 from .logger import app_logger
 from .exceptions import LLMException, ResourceException, ConfigurationException
-from .web_search_service import WebSearchService
-from .llama_file_search_service import LlamaFileSearchService
-from .tts_service import TTSService
 from .intent_detector import IntentDetector
 from .llm_text import LLMText
 from .handlers.file_search_handler import FileSearchHandler
@@ -15,31 +16,90 @@ from .handlers.web_search_handler import WebSearchHandler
 from .handlers.note_handler import NoteHandler
 
 
+class _LazyService:
+    """Build a service on first attribute access.
+
+    Search and TTS pull in torch, llama_index, FAISS and Kokoro, while most
+    sessions are plain chat, so their import and model load wait until a
+    handler actually uses them.
+    """
+
+    def __init__(self, factory):
+        self._factory = factory
+        self._service = None
+        # Concurrent first uses must not load the models twice
+        self._lock = threading.Lock()
+
+    def __getattr__(self, name):
+        if self._service is None:
+            with self._lock:
+                if self._service is None:
+                    self._service = self._factory()
+        return getattr(self._service, name)
+
+
+def _create_web_search_service():
+    from .web_search_service import WebSearchService
+    return WebSearchService()
+
+
+def _create_file_search_service():
+    from .llama_file_search_service import LlamaFileSearchService
+    return LlamaFileSearchService()
+
+
+def _create_tts_service():
+    from .tts_service import TTSService
+    return TTSService()
+
+
 class LLMService:
+    MAX_HISTORY = 16
+    # Keep the model (and its cached prompt prefix) resident between turns
+    KEEP_ALIVE = "30m"
+
     def __init__(self, model='mistral'):
         self.log = app_logger.get_logger("llm_service")
         self.log.info(f"Initializing LLM service with model: {model}")
         
         self.model = model
+        # One client, one pooled HTTP connection to the Ollama server
+        self.client = ollama.Client()
         self._check_gpu_availability()
         self.dialog_log_file = None
+        self._dialog_log_fh = None
+        # (epoch second, formatted stamp) reused by log lines within one second
+        self._log_ts = (0, "")
+        # Single writer thread keeps log I/O off the response path, in order
+        self._log_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="dialog_log")
 
         self.text = LLMText()
         self.intent_detector = IntentDetector()
-        self.tts = TTSService()
-        self.web = WebSearchService()
-        self.search = LlamaFileSearchService()
+        self.tts = _LazyService(_create_tts_service)
+        self.web = _LazyService(_create_web_search_service)
+        self.search = _LazyService(_create_file_search_service)
         self.memory_path = os.path.join("config", "memory.log")
 
-        self.system_prompt = {'role': 'system', 'content': self._build_system_prompt()}
-        self.history = [self.system_prompt]
+        memory_handler = MemoryHandler(self.memory_path, self.text, on_change=self._refresh_memory_prompt)
+
+        # The personality prompt never changes, so the request prefix stays
+        # byte-identical and Ollama can reuse its KV cache across turns.
+        # Memories live in a second system message that follows it.
+        self.system_prompt = {'role': 'system', 'content': self._load_personality()}
+        self._memory_lines = "".join(f"- {m}\n" for m in memory_handler.memories)
+        self.memory_prompt = {'role': 'system', 'content': self._format_memory_block()}
+        # Conversation turns only; the system prompt is prepended per request
+        self.history = deque(maxlen=self.MAX_HISTORY)
         self._create_new_dialog_log()
 
         # Handlers
         self.handlers = {
             "file_search": FileSearchHandler(self.search, self.tts, self.text),
-            "memory": MemoryHandler(self.memory_path, self.text),
-            "web_search": WebSearchHandler(self.web, self.model, self.system_prompt, self.text),
+            "memory": memory_handler,
+            "web_search": WebSearchHandler(
+                self.web, self.model, self.system_prompt, self.text,
+                client=self.client, keep_alive=self.KEEP_ALIVE, context=self._messages_for_request
+            ),
             "note": NoteHandler(),  # NoteHandler takes a path, not LLMText object
         }
 
@@ -63,24 +123,20 @@ class LLMService:
         except Exception as e:
             self.log.warning(f"Could not determine LLM GPU status: {e}")
 
-    def _build_system_prompt(self):
-        """Build the system prompt with memory and personality."""
-        memory_block = self._load_memory()
-        personality = self._load_personality()
-        return memory_block + personality
+    def _format_memory_block(self):
+        """Wrap the cached memory lines as the content of the memory system message."""
+        if not self._memory_lines:
+            return ""
+        return "[MEMORY]\n" + self._memory_lines + "[/MEMORY]"
 
-    def _load_memory(self):
-        """Load long-term memories from the memory file."""
-        try:
-            if os.path.exists(self.memory_path):
-                with open(self.memory_path, "r", encoding="utf-8") as f:
-                    memories = [line.strip() for line in f if line.strip()]
-                    if memories:
-                        memory_lines = [f"- {m}" for m in memories]
-                        return "[MEMORY]\n" + "\n".join(memory_lines) + "\n[/MEMORY]\n\n"
-        except IOError as e:
-            self.log.warning(f"Could not read memory file at {self.memory_path}: {e}")
-        return ""
+    def _refresh_memory_prompt(self, memories, added=None):
+        """Update the memory message after a memory change."""
+        if added is not None:
+            # Appends only extend the cached lines
+            self._memory_lines += f"- {added}\n"
+        else:
+            self._memory_lines = "".join(f"- {m}\n" for m in memories)
+        self.memory_prompt['content'] = self._format_memory_block()
 
     def _load_personality(self):
         """Load the assistant's personality from a config file."""
@@ -97,22 +153,44 @@ class LLMService:
             os.makedirs("logs", exist_ok=True)
             timestamp = datetime.now().strftime("%Y-%m-%d_%H-%M-%S")
             self.dialog_log_file = os.path.join("logs", f"dialog_{timestamp}.log")
+            # Kept open for the session and block-buffered; flushed once per turn
+            self._dialog_log_fh = open(self.dialog_log_file, "a", encoding="utf-8", buffering=8192)
+            atexit.register(self._close_dialog_log)
             self._append_to_dialog_log("SYSTEM", self.system_prompt['content'])
+            if self.memory_prompt['content']:
+                self._append_to_dialog_log("MEMORY", self.memory_prompt['content'])
         except IOError as e:
             self.log.error(f"Failed to create dialog log file: {e}")
             self.dialog_log_file = None
+            self._dialog_log_fh = None
 
     def _append_to_dialog_log(self, role, text):
-        """Append a message to the current dialog log."""
-        if not self.dialog_log_file:
+        """Queue a message for the current dialog log."""
+        if not self._dialog_log_fh:
             return
+        # Timestamp now, write later on the log thread
+        now = int(time.time())
+        if now != self._log_ts[0]:
+            self._log_ts = (now, time.strftime("%d-%m-%H-%M-%S", time.localtime(now)))
+        timestamp = self._log_ts[1]
+        line = f"[{timestamp}] {role}: {text.strip()}\n"
+        # The assistant entry closes a turn, so the whole turn hits disk together
+        self._log_executor.submit(self._write_dialog_line, line, role.startswith("ASSISTANT"))
+
+    def _write_dialog_line(self, line, flush):
         try:
-            timestamp = datetime.now().strftime("%d-%m-%H-%M-%S")
-            with open(self.dialog_log_file, "a", encoding="utf-8") as f:
-                f.write(f"[{timestamp}] {role}: {text.strip()}\n")
-        except IOError as e:
+            self._dialog_log_fh.write(line)
+            if flush:
+                self._dialog_log_fh.flush()
+        except (IOError, ValueError) as e:
             self.log.error(f"Failed to append to dialog log: {e}")
 
+    def _close_dialog_log(self):
+        """Drain queued log writes, then close the file."""
+        self._log_executor.shutdown(wait=True)
+        if self._dialog_log_fh:
+            self._dialog_log_fh.close()
+
     def _extract_ollama_metrics(self, response):
         """Extract performance metrics from Ollama response."""
         metrics = {}
@@ -156,16 +234,42 @@ class LLMService:
         
         return metrics
 
+    def _messages_for_request(self):
+        """System prompt, memories, then the retained conversation turns."""
+        if self.memory_prompt['content']:
+            return [self.system_prompt, self.memory_prompt, *self.history]
+        return [self.system_prompt, *self.history]
+
     def warmup_llm(self):
         """Warm up the LLM to reduce initial response time."""
         try:
-            ollama.chat(model=self.model, messages=[
+            self.client.chat(model=self.model, keep_alive=self.KEEP_ALIVE, messages=[
                 {'role': 'system', 'content': 'You are a warmup agent.'},
                 {'role': 'user', 'content': 'Just say: ready'}
             ])
         except Exception as e:
             raise LLMException("LLM warmup failed", context={"error": str(e)})
 
+    def stream_chat(self, prompt):
+        """Yield the general-chat reply piece by piece as Ollama generates it.
+
+        History and the dialog log are updated once the stream is exhausted,
+        so callers can hand each piece to TTS without waiting for the rest.
+        """
+        self.history.append({'role': 'user', 'content': prompt})
+        parts = []
+        stream = self.client.chat(
+            model=self.model, messages=self._messages_for_request(), stream=True, keep_alive=self.KEEP_ALIVE
+        )
+        for chunk in stream:
+            content = chunk['message']['content']
+            if content:
+                parts.append(content)
+                yield content
+        reply = "".join(parts)
+        self.history.append({'role': 'assistant', 'content': reply})
+        self._append_to_dialog_log("ASSISTANT", reply)
+
     def get_response(self, prompt):
         """Get a response from the LLM, handling intents and history."""
         self.log.debug("Getting LLM response...")
@@ -191,14 +295,9 @@ class LLMService:
 
             # Default: general LLM chat
             self.history.append({'role': 'user', 'content': prompt})
-            
-            # Ensure system prompt is always first in the messages sent to Ollama
-            messages_to_send = self.history[-16:]
-            if messages_to_send[0]['role'] != 'system':
-                # Always include system prompt at the start
-                messages_to_send = [self.system_prompt] + messages_to_send
-            
-            response = ollama.chat(model=self.model, messages=messages_to_send)
+            response = self.client.chat(
+                model=self.model, messages=self._messages_for_request(), keep_alive=self.KEEP_ALIVE
+            )
             reply = response['message']['content']
             self.history.append({'role': 'assistant', 'content': reply})
             self._append_to_dialog_log("ASSISTANT", reply)
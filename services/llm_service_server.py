@@ -9,6 +9,7 @@ import os
 project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
 sys.path.insert(0, project_root)
 
+import asyncio
 import uvicorn
 from fastapi import FastAPI
 from pydantic import BaseModel
@@ -22,6 +23,10 @@ log = app_logger.get_logger("llm_microservice")
 # Initialize LLM service
 llm_service = None
 
+# LLMService keeps one conversation history, so /chat turns run one at a time
+# in a worker thread instead of on the event loop
+chat_lock = None
+
 class ChatRequest(BaseModel):
     prompt: str
 
@@ -31,10 +36,11 @@ class WarmupResponse(BaseModel):
 @app.on_event("startup")
 async def startup_event():
     """Initialize the LLM service on startup."""
-    global llm_service
+    global llm_service, chat_lock
     log.info("Starting LLM microservice...")
     try:
         llm_service = LLMService(model='llama3.1:8b-instruct-q4_K_M')
+        chat_lock = asyncio.Lock()
         log.info("LLM microservice started successfully")
     except Exception as e:
         log.error(f"Failed to start LLM microservice: {e}", exc_info=True)
@@ -53,7 +59,11 @@ async def chat(request: ChatRequest):
     if not llm_service:
         return {"error": "LLM service not initialized"}, 503
     try:
-        result = llm_service.get_response(request.prompt)
+        # Keep the event loop free for /health during generation
+        async with chat_lock:
+            result = await asyncio.get_running_loop().run_in_executor(
+                None, llm_service.get_response, request.prompt
+            )
         
         # Handle both tuple and single return values
         if isinstance(result, tuple):
@@ -5,6 +5,8 @@ Supports both regular HTTP requests and Server-Sent Events (SSE) streaming.
 """
 
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 import time
 import json
 import sseclient
@@ -17,10 +19,18 @@ from .intent_detector import IntentDetector
 class StreamingLLMClient:
     """HTTP client for LLM microservice with streaming support."""
     
-    def __init__(self, host="127.0.0.1", port=8003, timeout=120):
+    def __init__(self, host="127.0.0.1", port=8003, timeout=120, session=None):
         self.log = app_logger.get_logger("streaming_llm_client")
         self.base_url = f"http://{host}:{port}"
         self.timeout = timeout
+        # One pooled keep-alive session instead of a fresh connection per request;
+        # callers that already hold one (LLMClient) can share it
+        self.session = session or requests.Session()
+        if session is None:
+            self.session.mount("http://", HTTPAdapter(
+                pool_connections=1, pool_maxsize=4,
+                max_retries=Retry(total=2, backoff_factor=0.2)
+            ))
         self.intent_detector = IntentDetector()
         self.log.info(f"Streaming LLM client initialized for {self.base_url}")
     
@@ -28,7 +38,7 @@ class StreamingLLMClient:
         """Get a non-streaming response (backward compatibility)."""
         try:
             start_time = time.time()
-            response = requests.post(
+            response = self.session.post(
                 f"{self.base_url}/chat",
                 json={"prompt": prompt},
                 timeout=self.timeout
@@ -72,7 +82,7 @@ class StreamingLLMClient:
         try:
             self.log.info(f"Starting streaming request for: '{prompt[:50]}...'")
             
-            response = requests.post(
+            response = self.session.post(
                 f"{self.base_url}/chat/stream",
                 json={
                     "prompt": prompt,
@@ -85,20 +95,22 @@ class StreamingLLMClient:
             
             if response.status_code != 200:
                 error_msg = f"Streaming request failed: {response.status_code} - {response.text}"
+                response.close()  # Return the connection to the pool
                 self.log.error(error_msg)
                 raise LLMException(error_msg)
             
             # Process Server-Sent Events
-            client = sseclient.SSEClient(response)
-            
-            for event in client.events():
-                if event.data:
-                    try:
-                        data = json.loads(event.data)
-                        yield data
-                    except json.JSONDecodeError as e:
-                        self.log.warning(f"Failed to parse SSE data: {e}")
-                        continue
+            with response:
+                client = sseclient.SSEClient(response)
+                
+                for event in client.events():
+                    if event.data:
+                        try:
+                            data = json.loads(event.data)
+                            yield data
+                        except json.JSONDecodeError as e:
+                            self.log.warning(f"Failed to parse SSE data: {e}")
+                            continue
                         
         except requests.exceptions.RequestException as e:
             error_msg = f"Streaming communication error: {e}"
@@ -114,19 +126,28 @@ class StreamingLLMClient:
         Simplified streaming interface that yields only text chunks.
         Perfect for TTS integration.
         """
+        streamed = False
         for chunk_data in self.get_streaming_response(prompt, **kwargs):
-            if chunk_data.get('type') == 'chunk' and chunk_data.get('content'):
+            chunk_type = chunk_data.get('type')
+            if chunk_type == 'chunk' and chunk_data.get('content'):
+                streamed = True
                 yield chunk_data['content']
-            elif chunk_data.get('type') == 'complete' and chunk_data.get('content'):
+            elif chunk_type == 'complete':
                 # Yield the complete response if no chunks were sent
-                content = chunk_data['content']
-                if content:
-                    yield content
+                if not streamed and chunk_data.get('content'):
+                    yield chunk_data['content']
+                break
+            elif chunk_type == 'error':
+                raise LLMException(chunk_data.get('content', 'Unknown streaming error'))
+    
+    def get_response_stream(self, prompt: str) -> Iterator[str]:
+        """Stream the reply as text chunks so TTS can start on the first one."""
+        return self.get_streaming_text(prompt)
     
     def warmup_llm(self):
         """Send warmup request to LLM microservice."""
         try:
-            response = requests.post(
+            response = self.session.post(
                 f"{self.base_url}/warmup",
                 timeout=self.timeout
             )
@@ -147,7 +168,7 @@ class StreamingLLMClient:
     def health_check(self):
         """Check if the LLM microservice is responsive."""
         try:
-            response = requests.get(f"{self.base_url}/health", timeout=5)
+            response = self.session.get(f"{self.base_url}/health", timeout=5)
             if response.status_code == 200:
                 result = response.json()
                 return result.get("status") == "healthy"
@@ -155,6 +176,10 @@ class StreamingLLMClient:
         except:
             return False
 
+    def close(self):
+        """Release pooled connections."""
+        self.session.close()
+
 
 class StreamingTTSIntegration:
     """
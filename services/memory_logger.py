@@ -1,7 +1,6 @@
 # services/memory_logger.py
 import subprocess
 import threading
-import time
 import os
 import psutil
 from datetime import datetime
@@ -25,17 +24,28 @@ class MemoryLogger:
         if os.path.exists(self.log_file):
             os.remove(self.log_file)
 
-    def _get_gpu_vram_by_name(self, name):
+    def _get_gpu_vram_by_process(self):
+        """Return VRAM used (MiB) per target process from a single nvidia-smi query."""
+        usage = {name: 0 for name in self.TARGET_PROCESSES}
         try:
             result = subprocess.run(
-                "nvidia-smi pmon -c 1",
-                shell=True, capture_output=True, text=True
+                ['nvidia-smi', '--query-compute-apps=process_name,used_memory', '--format=csv,noheader,nounits'],
+                capture_output=True, text=True, check=True
             )
-            lines = result.stdout.strip().splitlines()
-            matching = [int(line.split()[4]) for line in lines if name in line]
-            return sum(matching)
         except Exception:
-            return 0
+            return usage
+
+        for line in result.stdout.strip().splitlines():
+            try:
+                name, used = line.rsplit(', ', 1)
+                used = int(used)
+            except ValueError:
+                continue
+            name = name.lower()
+            for target in self.TARGET_PROCESSES:
+                if target in name:
+                    usage[target] += used
+        return usage
 
     def _get_total_gpu(self):
         try:
@@ -50,14 +60,17 @@ class MemoryLogger:
 
     def _get_process_stats(self):
         stats = {name: {"ram": 0, "cpu": 0} for name in self.TARGET_PROCESSES}
+        # process_iter() already reads these attributes in one pass per process;
+        # reuse proc.info instead of querying /proc again for each field.
         for proc in psutil.process_iter(['name', 'memory_info', 'cpu_percent']):
             try:
                 name = proc.info['name']
                 if name:
+                    name = name.lower()
                     for target in self.TARGET_PROCESSES:
-                        if target in name.lower():
-                            stats[target]["ram"] += proc.memory_info().rss // (1024 * 1024)
-                            stats[target]["cpu"] += proc.cpu_percent(interval=None)
+                        if target in name:
+                            stats[target]["ram"] += proc.info['memory_info'].rss // (1024 * 1024)
+                            stats[target]["cpu"] += proc.info['cpu_percent'] or 0
             except Exception:
                 continue
         return stats
@@ -70,9 +83,10 @@ class MemoryLogger:
             while not self._stop_event.is_set():
                 now = datetime.now().strftime('%m-%d %H:%M:%S')
                 gpu_used, gpu_total = self._get_total_gpu()
-                gpu_python = self._get_gpu_vram_by_name("python")
-                gpu_ollama = self._get_gpu_vram_by_name("ollama")
-                gpu_oww = self._get_gpu_vram_by_name("openwakeword")
+                gpu_procs = self._get_gpu_vram_by_process()
+                gpu_python = gpu_procs["python"]
+                gpu_ollama = gpu_procs["ollama"]
+                gpu_oww = gpu_procs["openwakeword"]
 
                 proc_stats = self._get_process_stats()
 
@@ -83,7 +97,9 @@ class MemoryLogger:
 
                 # Dashboard integration handled by main dashboard service
 
-                time.sleep(self.interval)
+                # Event.wait returns as soon as stop() is called instead of
+                # sleeping out the full interval.
+                self._stop_event.wait(self.interval)
 
     def start(self):
         self.log.info("VRAM and system monitoring started")
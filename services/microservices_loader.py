@@ -3,6 +3,7 @@ import webrtcvad
 import numpy as np
 import os
 import time
+import socket
 import requests
 from openwakeword.model import Model
 from .stt_client import STTClient
@@ -13,6 +14,27 @@ from .service_manager import ServiceManager
 from .logger import app_logger
 from .exceptions import ServiceInitializationException, ResourceException
 
+def _wait_until_ready(client, port, timeout=30.0, host="127.0.0.1"):
+    """Wait for a microservice with a cheap TCP probe and exponential backoff.
+
+    The HTTP health check only runs once the port accepts connections, so a
+    service that comes up in 200 ms is noticed in about 200 ms instead of on
+    the next one-second poll.
+    """
+    deadline = time.monotonic() + timeout
+    delay = 0.01
+    while time.monotonic() < deadline:
+        try:
+            with socket.create_connection((host, port), timeout=0.1):
+                pass
+            if client.health_check():
+                return True
+        except OSError:
+            pass
+        time.sleep(delay)
+        delay = min(delay * 2, 0.5)
+    return False
+
 def load_services_microservices():
     """Load voice assistant services using microservices architecture."""
     log = app_logger.get_logger("microservices_loader")
@@ -74,33 +96,24 @@ def load_services_microservices():
         
         # TTS Client
         tts_service = TTSClient(port=8001)
-        for attempt in range(30):
-            if tts_service.health_check():
-                log.debug("TTS microservice is ready")
-                break
-            time.sleep(1)
+        if _wait_until_ready(tts_service, 8001):
+            log.debug("TTS microservice is ready")
         else:
             raise ServiceInitializationException("TTS", "TTS microservice failed to become ready")
         services["tts_service"] = tts_service
         
         # STT Client
         stt_service = STTClient(port=8002, dynamic_rms=dynamic_rms)
-        for attempt in range(30):
-            if stt_service.health_check():
-                log.debug("STT microservice is ready")
-                break
-            time.sleep(1)
+        if _wait_until_ready(stt_service, 8002):
+            log.debug("STT microservice is ready")
         else:
             raise ServiceInitializationException("STT", "STT microservice failed to become ready")
         services["stt_service"] = stt_service
         
         # LLM Client
         llm_service = StreamingLLMClient(port=8003)
-        for attempt in range(30):
-            if llm_service.health_check():
-                log.debug("LLM microservice is ready")
-                break
-            time.sleep(1)
+        if _wait_until_ready(llm_service, 8003):
+            log.debug("LLM microservice is ready")
         else:
             raise ServiceInitializationException("LLM", "LLM microservice failed to become ready")
         services["llm_service"] = llm_service
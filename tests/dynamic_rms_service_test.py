@@ -20,6 +20,35 @@ class TestDynamicRMSService:
         self.rms_service.update_threshold(noisy_audio)
         assert self.rms_service.get_threshold() > 0.0
 
+    def test_threshold_tracks_ring_buffer_window(self):
+        """Test the running mean over a window that wraps more than once."""
+        service = DynamicRMSService(window_seconds=0.3, multiplier=2.0)  # 10-frame window
+        service.vad = type("NoSpeech", (), {"is_speech": lambda self, chunk, sample_rate: False})()
+
+        def frame(level):
+            return np.full(480, level, dtype=np.int16).tobytes()
+
+        for _ in range(4):
+            service.update_threshold(frame(1000))
+        # Partially filled window averages only the frames seen so far
+        assert service.get_threshold() == pytest.approx(1000 / 32767 * 2.0)
+
+        for _ in range(6):
+            service.update_threshold(frame(1000))
+        for _ in range(5):
+            service.update_threshold(frame(3000))
+        # Half the window now holds the louder frames
+        assert service.get_threshold() == pytest.approx(2000 / 32767 * 2.0)
+
+        for _ in range(25):
+            service.update_threshold(frame(3000))
+        # Older frames have fully aged out after several laps
+        assert service.get_threshold() == pytest.approx(3000 / 32767 * 2.0)
+
+        service.lock()
+        service.update_threshold(frame(100))
+        assert service.get_threshold() == pytest.approx(3000 / 32767 * 2.0)
+
 if __name__ == "__main__":
     pytest.main(["-v"])
 
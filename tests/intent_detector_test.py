@@ -28,6 +28,12 @@ class TestIntentDetector:
         assert self.detector.detect("who is Albert Einstein") == "web_search"
         assert self.detector.detect("tell me about quantum physics") == "web_search"
 
+    def test_intent_priority(self):
+        """Test that memory wins over search keywords anywhere in the prompt."""
+        assert self.detector.detect("find my keys and remember to call mom") == "memory"
+        assert self.detector.detect("search the web and list memories") == "memory"
+        assert self.detector.detect("what is the config file, where is it") == "file_search"
+
     def test_default_intent(self):
         """Test default intent for unrecognized patterns."""
         assert self.detector.detect("hello there") == "default"
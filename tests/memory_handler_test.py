@@ -0,0 +1,111 @@
+import os
+import pytest
+from services.handlers.memory_handler import MemoryHandler
+from services.llm_text import LLMText
+
+class TestMemoryHandler:
+    def setup_method(self):
+        """Setup shared LLM text for testing."""
+        self.text = LLMText()
+        self.changes = []
+
+    def _handler(self, tmp_path):
+        self.path = tmp_path / "config" / "memory.log"
+        handler = MemoryHandler(str(self.path), self.text,
+                                on_change=lambda memories, added: self.changes.append(added))
+        # Long enough that no timer fires mid-test; tests flush() explicitly
+        handler.FLUSH_DELAY = 30
+        return handler
+
+    def _lines(self):
+        return self.path.read_text(encoding="utf-8").splitlines()
+
+    def test_remember_appends_immediately(self, tmp_path):
+        """Test that adds are appended without waiting for a flush."""
+        handler = self._handler(tmp_path)
+        handler.handle("remember to buy milk")
+        handler.handle("please remember to call mom")
+        assert self._lines() == ["buy milk", "call mom"]
+        assert self.changes == ["buy milk", "call mom"]
+
+    def test_remember_after_edit_without_trailing_newline(self, tmp_path):
+        """Test that an add never joins the last line of a hand-edited file."""
+        self.path = tmp_path / "config" / "memory.log"
+        self.path.parent.mkdir()
+        self.path.write_bytes(b"a\nb")
+        handler = self._handler(tmp_path)
+        handler.handle("remember to c")
+        assert self._lines() == ["a", "b", "c"]
+        assert handler.memories == ["a", "b", "c"]
+
+    def test_update_and_remove_are_debounced(self, tmp_path):
+        """Test that update/remove defer the rewrite until it is flushed."""
+        handler = self._handler(tmp_path)
+        for memory in ("one", "two", "three"):
+            handler.handle(f"remember to {memory}")
+
+        assert handler.handle("update memory 1 to uno") == self.text.format("memory.update", index=1)
+        assert handler.handle("remove memory 2") == self.text.format("memory.remove", index=2)
+        assert self._lines() == ["one", "two", "three"]  # not written yet
+
+        handler.flush()
+        assert self._lines() == ["uno", "three"]
+
+    def test_remember_while_rewrite_pending(self, tmp_path):
+        """Test that an add during a pending rewrite is not lost."""
+        handler = self._handler(tmp_path)
+        handler.handle("remember to one")
+        handler.handle("update memory 1 to uno")
+        handler.handle("remember to two")
+        handler.flush()
+        assert self._lines() == ["uno", "two"]
+
+    def test_missing_index(self, tmp_path):
+        """Test update/remove of a memory that does not exist."""
+        handler = self._handler(tmp_path)
+        assert handler.handle("remove memory 3") == self.text.get("memory.missing")
+        assert handler.handle("update memory 0 to x") == self.text.get("memory.missing")
+
+    def test_list_memories(self, tmp_path):
+        """Test listing, including the cached rendering after a change."""
+        handler = self._handler(tmp_path)
+        assert handler.handle("list memories") == self.text.get("memory.empty")
+        handler.handle("remember to one")
+        assert handler.handle("list memories").endswith("\n1. one")
+        handler.handle("remember to two")
+        assert handler.handle("list memories").endswith("\n1. one\n2. two")
+
+    def test_reload_after_external_edit(self, tmp_path):
+        """Test that an edit made outside the handler is picked up."""
+        handler = self._handler(tmp_path)
+        handler.handle("remember to one")
+
+        self.path.write_text("edited\nby hand\n", encoding="utf-8")
+        stat = os.stat(self.path)
+        os.utime(self.path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000))
+
+        assert handler.handle("list memories").endswith("\n1. edited\n2. by hand")
+        assert handler.memories == ["edited", "by hand"]
+
+    def test_rewrite_is_atomic(self, tmp_path, monkeypatch):
+        """Test that a failed rewrite leaves the previous file intact."""
+        handler = self._handler(tmp_path)
+        handler.handle("remember to one")
+        handler.handle("remember to two")
+
+        handler.handle("remove memory 1")
+        def fail_replace(src, dst):
+            raise OSError("disk full")
+        monkeypatch.setattr(os, "replace", fail_replace)
+        with pytest.raises(OSError):
+            handler.flush()
+        assert self._lines() == ["one", "two"]
+
+        monkeypatch.undo()
+        handler.handle("remove memory 1")
+        handler.flush()
+        assert self._lines() == []
+        assert not os.path.exists(str(self.path) + ".tmp")
+
+if __name__ == "__main__":
+    pytest.main(["-v"])
@@ -0,0 +1,68 @@
+import json
+import pytest
+from services.handlers.note_handler import NoteHandler
+
+class TestNoteHandler:
+    def setup_method(self):
+        """Setup paths for testing."""
+        self.path = None
+
+    def _handler(self, tmp_path):
+        self.path = tmp_path / "config" / "notes.jsonl"
+        return NoteHandler(str(self.path))
+
+    def _lines(self):
+        return [json.loads(line) for line in self.path.read_text().splitlines() if line.strip()]
+
+    def test_take_note_appends(self, tmp_path):
+        """Test that each new note is appended as one JSON line."""
+        handler = self._handler(tmp_path)
+        handler.handle("take a note: buy milk")
+        handler.handle("take a note: call mom")
+        assert [n["text"] for n in self._lines()] == ["buy milk", "call mom"]
+
+    def test_migrates_legacy_json(self, tmp_path):
+        """Test one-time migration from notes.json to notes.jsonl."""
+        legacy = tmp_path / "config" / "notes.json"
+        legacy.parent.mkdir()
+        notes = [{"text": "old one", "timestamp": "t1"}, {"text": "old two", "timestamp": "t2"}]
+        legacy.write_text(json.dumps(notes, indent=2))
+
+        handler = self._handler(tmp_path)
+        assert handler.notes == notes
+        assert self._lines() == notes
+        assert "1. old one\n2. old two" in handler.handle("show notes")
+        assert json.loads(legacy.read_text()) == notes  # kept as a backup
+
+    def test_jsonl_wins_over_legacy_json(self, tmp_path):
+        """Test that an existing notes.jsonl is used and notes.json is left alone."""
+        config = tmp_path / "config"
+        config.mkdir()
+        legacy = config / "notes.json"
+        legacy_text = json.dumps([{"text": "old", "timestamp": "t0"}])
+        legacy.write_text(legacy_text)
+        (config / "notes.jsonl").write_text(json.dumps({"text": "new", "timestamp": "t1"}) + "\n")
+
+        handler = self._handler(tmp_path)
+        assert [n["text"] for n in handler.notes] == ["new"]
+        assert legacy.read_text() == legacy_text
+
+    def test_delete_rewrites_file(self, tmp_path):
+        """Test that deleting a note rewrites the remaining notes in order."""
+        handler = self._handler(tmp_path)
+        for text in ("first", "second", "third"):
+            handler.handle(f"take a note: {text}")
+
+        assert handler.handle("delete note 2") == "Deleted note: second"
+        assert [n["text"] for n in self._lines()] == ["first", "third"]
+        assert [n["text"] for n in NoteHandler(str(self.path)).notes] == ["first", "third"]
+
+    def test_delete_missing_note(self, tmp_path):
+        """Test deleting an out-of-range note leaves the file alone."""
+        handler = self._handler(tmp_path)
+        handler.handle("take a note: only")
+        assert handler.handle("delete note 5") == "Couldn’t find that note to delete."
+        assert [n["text"] for n in self._lines()] == ["only"]
+
+if __name__ == "__main__":
+    pytest.main(["-v"])